@@ -0,0 +1,127 @@
+# cython: language_level=3
+# cython: boundscheck=False, wraparound=False, initializedcheck=False
+"""Compiled tokenizer for the VCD value-change section.
+
+Optional companion to analyze-vcd.py; build it in place with
+
+    make vcd-fast
+
+(or `python3 -m Cython.Build.Cythonize -i scripts/_vcd_fast.pyx`).
+The analyzer falls back to its pure-Python loop when this module is
+not built.
+"""
+
+import numpy as np
+
+
+def parse_body(const unsigned char[::1] buf, Py_ssize_t pos, const long long[::1] id_table):
+    """Tokenize value changes in buf[pos:].
+
+    id_table is the flat 16K-entry id-code index built by VCDParser
+    (-1 marks ids without storage). Returns (times, signal_indices,
+    value_codes, endtime) as flat event arrays; the caller splits
+    them per signal.
+    """
+    cdef Py_ssize_t size = buf.shape[0]
+    cdef Py_ssize_t cap = 1 << 16
+    cdef Py_ssize_t count = 0
+    cdef Py_ssize_t start, end, p
+    cdef long long current_time = 0, endtime = 0, t
+    cdef long long idx
+    cdef unsigned char first, code
+    cdef unsigned char value_code[128]
+
+    times_arr = np.empty(cap, dtype=np.int64)
+    ids_arr = np.empty(cap, dtype=np.int32)
+    vals_arr = np.empty(cap, dtype=np.uint8)
+    cdef long long[::1] times = times_arr
+    cdef int[::1] ids = ids_arr
+    cdef unsigned char[::1] vals = vals_arr
+
+    # Scalar value encoding, same as the Python side: 0/1/x/z -> 0/1/2/3
+    for p in range(128):
+        value_code[p] = 0
+    value_code[c'1'] = 1
+    value_code[c'x'] = 2
+    value_code[c'X'] = 2
+    value_code[c'z'] = 3
+    value_code[c'Z'] = 3
+
+    while pos < size:
+        end = pos
+        while end < size and buf[end] != c'\n':
+            end += 1
+        start = pos
+        pos = end + 1
+
+        # Strip surrounding whitespace
+        while end > start and buf[end - 1] <= c' ':
+            end -= 1
+        while start < end and buf[start] <= c' ':
+            start += 1
+        if start >= end:
+            continue
+
+        first = buf[start]
+        idx = -1
+
+        if first == c'#':
+            # Timestamp
+            t = 0
+            p = start + 1
+            while p < end and c'0' <= buf[p] <= c'9':
+                t = t * 10 + (buf[p] - c'0')
+                p += 1
+            current_time = t
+            if t > endtime:
+                endtime = t
+            continue
+        elif first == c'b':
+            # Binary value: b0101 id_code (vectors reduce to their MSB)
+            p = start + 1
+            while p < end and buf[p] != c' ':
+                p += 1
+            if p == start + 1:
+                continue
+            code = value_code[buf[start + 1] & 0x7f]
+            while p < end and buf[p] == c' ':
+                p += 1
+            start = p
+        elif first == c'0' or first == c'1' or first == c'x' or \
+                first == c'z' or first == c'X' or first == c'Z':
+            # Scalar value: 0id_code or 1id_code
+            if end - start < 2:
+                continue
+            code = value_code[first]
+            start += 1
+        else:
+            continue
+
+        # Resolve the id code through the flat table (ids longer than
+        # two characters never reach this tokenizer). Bytes outside
+        # 7-bit ASCII would index past the 16K table; reject them like
+        # the pure-Python loop does instead of reading out of bounds
+        if end - start == 1:
+            if buf[start] >= 128:
+                raise ValueError("non-ASCII id code in value change")
+            idx = id_table[buf[start] * 128]
+        elif end - start == 2:
+            if buf[start] >= 128 or buf[start + 1] >= 128:
+                raise ValueError("non-ASCII id code in value change")
+            idx = id_table[buf[start] * 128 + buf[start + 1]]
+
+        if idx >= 0:
+            if count == cap:
+                cap *= 2
+                times_arr = np.resize(times_arr, cap)
+                ids_arr = np.resize(ids_arr, cap)
+                vals_arr = np.resize(vals_arr, cap)
+                times = times_arr
+                ids = ids_arr
+                vals = vals_arr
+            times[count] = current_time
+            ids[count] = idx
+            vals[count] = code
+            count += 1
+
+    return times_arr[:count], ids_arr[:count], vals_arr[:count], endtime
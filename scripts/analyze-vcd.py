@@ -8,94 +8,281 @@ Usage:
     python3 analyze-vcd.py waves.vcd [--report report.txt]
 
 Requirements:
-    None - uses built-in Python libraries only
+    numpy
+    numba (optional - JIT-compiles the analysis loops when available)
 """
 
 import sys
+import mmap
 import argparse
-from collections import defaultdict
+
+import numpy as np
+
+try:
+    import _vcd_fast  # Compiled tokenizer, see scripts/_vcd_fast.pyx
+except ImportError:
+    _vcd_fast = None
+
+try:
+    from numba import njit
+except ImportError:
+    # Fall back to the plain Python loops when numba is not installed
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+# Timing validation bound, folded once at import: sync periods must
+# stay within 1% of their mean (mode-agnostic, so it holds for every
+# supported video mode)
+_MAX_VARIANCE = 0.01
+_MAX_VARIANCE_PCT = _MAX_VARIANCE * 100
+
+# Scalar value encoding for the uint8 value arrays: 0/1/x/z -> 0/1/2/3
+_VALUE_CODE = bytearray(128)
+for _ch, _code in ((b"0", 0), (b"1", 1), (b"x", 2), (b"X", 2), (b"z", 3), (b"Z", 3)):
+    _VALUE_CODE[_ch[0]] = _code
+_VALUE_CODE = bytes(_VALUE_CODE)
+
+
+@njit(cache=True)
+def find_glitches(times, vals, threshold):
+    """Find pulses shorter than threshold; returns (indices, durations)"""
+    n = len(times)
+    indices = np.empty(n, dtype=np.int64)
+    durations = np.empty(n, dtype=np.int64)
+    count = 0
+    for i in range(n - 1):
+        duration = times[i + 1] - times[i]
+        if duration < threshold and vals[i] != vals[i + 1]:
+            indices[count] = i
+            durations[count] = duration
+            count += 1
+    return indices[:count], durations[:count]
 
 
 class VCDParser:
-    """Minimal VCD parser - no external dependencies"""
+    """Minimal VCD parser storing signals as NumPy arrays"""
+
+    # Initial per-signal transition capacity; grown by doubling
+    INITIAL_CAPACITY = 1024
 
-    def __init__(self, filename):
+    def __init__(self, filename, signals_of_interest=None):
         self.filename = filename
+        # Optional substring whitelist; transitions of non-matching
+        # signals are skipped entirely to save memory and parse time
+        self.signals_of_interest = signals_of_interest
         self.timescale = "1 ns"
         self.endtime = 0
         self.signals = {}  # id_code -> signal_name
-        self.signal_data = defaultdict(list)  # signal_name -> [(time, value), ...]
+        # signal_name -> (times int64 array, values uint8 array),
+        # structure-of-arrays layout to keep memory compact and let
+        # the analyzers operate on whole signals at once
+        self.signal_data = {}
+        # Dense per-signal storage, set up once the header is parsed
+        self._idx_names = []
+        self._buffers = []
+        self._id_table = []
+        self._id_dict = {}
+        # Memoized get_signal lookups (substring -> resolved data)
+        self._by_substring = {}
+
+    def _setup_storage(self):
+        """Build the id-code index and preallocate per-signal arrays.
+
+        Id codes map to dense integers (ids sharing a reference name
+        share one index, matching the old name-keyed storage). Codes of
+        one or two printable-ASCII characters resolve through a flat
+        table - no dict lookup in the hot loop; longer codes fall back
+        to a dict.
+        """
+        name_to_idx = {}
+        self._id_table = [-1] * (128 * 128)
+        whitelist = self.signals_of_interest
+        for id_code, name in self.signals.items():
+            if whitelist is not None and not any(s in name for s in whitelist):
+                continue
+            idx = name_to_idx.get(name)
+            if idx is None:
+                idx = name_to_idx[name] = len(self._idx_names)
+                self._idx_names.append(name)
+            if len(id_code) <= 2:
+                key = id_code[0] * 128 + (id_code[1] if len(id_code) > 1 else 0)
+                self._id_table[key] = idx
+            else:
+                self._id_dict[id_code] = idx
+        self._buffers = [
+            [
+                np.empty(self.INITIAL_CAPACITY, dtype=np.int64),
+                np.empty(self.INITIAL_CAPACITY, dtype=np.uint8),
+                0,
+            ]
+            for _ in self._idx_names
+        ]
+
+    def _signal_index(self, id_code):
+        """Resolve an id code to its dense signal index (-1 if unknown)"""
+        if len(id_code) <= 2:
+            return self._id_table[
+                id_code[0] * 128 + (id_code[1] if len(id_code) > 1 else 0)
+            ]
+        return self._id_dict.get(id_code, -1)
+
+    @staticmethod
+    def _append(buf, time, code):
+        """Append one transition to a signal's growable arrays"""
+        times, vals, n = buf
+        if n == len(times):
+            buf[0] = times = np.resize(times, 2 * n)
+            buf[1] = vals = np.resize(vals, 2 * n)
+        times[n] = time
+        vals[n] = code
+        buf[2] = n + 1
 
     def parse(self):
-        """Parse VCD file"""
-        with open(self.filename, "r") as f:
-            in_header = True
-            current_time = 0
-
-            for line in f:
-                line = line.strip()
-
-                if not line:
-                    continue
-
-                # Header section
-                if in_header:
-                    if line.startswith("$timescale"):
-                        self.timescale = line.split()[1]
-                    elif line.startswith("$var"):
-                        # $var type size id_code reference_name $end
-                        parts = line.split()
-                        if len(parts) >= 5:
-                            id_code = parts[3]
-                            ref_name = parts[4]
-                            self.signals[id_code] = ref_name
-                    elif line.startswith("$enddefinitions"):
-                        in_header = False
-                    continue
-
-                # Value change dump section
-                if line.startswith("#"):
-                    # Timestamp
-                    current_time = int(line[1:])
-                    self.endtime = max(self.endtime, current_time)
-                elif line.startswith("b"):
-                    # Binary value: b0101 id_code
-                    parts = line.split()
-                    if len(parts) >= 2:
-                        value = parts[0][1:]  # Remove 'b' prefix
-                        id_code = parts[1]
-                        if id_code in self.signals:
-                            signal_name = self.signals[id_code]
-                            self.signal_data[signal_name].append((current_time, value))
-                elif len(line) >= 2 and line[0] in "01xzXZ":
-                    # Scalar value: 0id_code or 1id_code
-                    value = line[0]
-                    id_code = line[1:]
-                    if id_code in self.signals:
-                        signal_name = self.signals[id_code]
-                        self.signal_data[signal_name].append((current_time, value))
+        """Parse VCD file: header pass, then the value-change section"""
+        # mmap the whole trace: zero-copy, page-cache friendly, and no
+        # per-line read or decode overhead on multi-GB files
+        with open(self.filename, "rb") as f:
+            f.seek(0, 2)
+            size = f.tell()
+            if size:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    self._parse_mapped(mm, size)
+
+        # Truncate the growable arrays to their actual lengths; signals
+        # without transitions are omitted, as before
+        self.signal_data = {
+            self._idx_names[i]: (times[:n], vals[:n])
+            for i, (times, vals, n) in enumerate(self._buffers)
+            if n > 0
+        }
 
         return True
 
+    def _parse_mapped(self, mm, size):
+        """Scan the mapped file line by line via bytes.find"""
+        in_header = True
+        current_time = 0
+        pos = 0
+
+        while pos < size:
+            nl = mm.find(b"\n", pos)
+            if nl < 0:
+                # Last line of a file without a trailing newline
+                line = mm[pos:size]
+                pos = size
+            else:
+                line = mm[pos:nl]
+                pos = nl + 1
+
+            line = line.strip()
+
+            if not line:
+                continue
+
+            # Header section
+            if in_header:
+                if line.startswith(b"$timescale"):
+                    self.timescale = line.split()[1].decode()
+                elif line.startswith(b"$var"):
+                    # $var type size id_code reference_name $end
+                    parts = line.split()
+                    if len(parts) >= 5:
+                        id_code = parts[3]
+                        ref_name = parts[4]
+                        # Names are decoded once here; value-change
+                        # tokens stay as bytes in the hot loop
+                        self.signals[id_code] = ref_name.decode()
+                elif line.startswith(b"$enddefinitions"):
+                    in_header = False
+                    self._setup_storage()
+                    # Hand the whole value-change section to the
+                    # compiled tokenizer when it is built (it only
+                    # understands the flat id table, not long ids)
+                    if _vcd_fast is not None and not self._id_dict:
+                        self._parse_body_fast(mm, pos)
+                        return
+                    # Local bindings for the per-event hot loop
+                    id_table = self._id_table
+                    buffers = self._buffers
+                continue
+
+            # Value change dump section; dispatch on the first byte
+            first = line[:1]
+            if first == b"#":
+                # Timestamp
+                current_time = int(line[1:])
+                self.endtime = max(self.endtime, current_time)
+            elif first == b"b":
+                # Binary value: b0101 id_code; vectors are reduced
+                # to their MSB bit (the analyzers only consume
+                # 1-bit sync/video signals)
+                parts = line.split()
+                if len(parts) >= 2 and len(parts[0]) > 1:
+                    idx = self._signal_index(parts[1])
+                    if idx >= 0:
+                        self._append(
+                            buffers[idx],
+                            current_time,
+                            _VALUE_CODE[parts[0][1]],
+                        )
+            elif len(line) >= 2 and line[0] in b"01xzXZ":
+                # Scalar value: 0id_code or 1id_code
+                id_code = line[1:]
+                if len(id_code) <= 2:
+                    idx = id_table[
+                        id_code[0] * 128 + (id_code[1] if len(id_code) > 1 else 0)
+                    ]
+                else:
+                    idx = self._id_dict.get(id_code, -1)
+                if idx >= 0:
+                    self._append(buffers[idx], current_time, _VALUE_CODE[line[0]])
+
+    def _parse_body_fast(self, mm, pos):
+        """Tokenize the value-change section with the C extension"""
+        id_table = np.asarray(self._id_table, dtype=np.int64)
+        times, ids, vals, endtime = _vcd_fast.parse_body(mm, pos, id_table)
+        self.endtime = max(self.endtime, int(endtime))
+
+        # Split the flat event stream into the per-signal buffers
+        for i, buf in enumerate(self._buffers):
+            sel = np.flatnonzero(ids == i)
+            buf[0] = times[sel]
+            buf[1] = vals[sel]
+            buf[2] = len(sel)
+
     def get_signal(self, signal_name):
-        """Get signal data by name (partial match)"""
+        """Get (times, values) arrays by name (partial match)"""
+        if signal_name in self._by_substring:
+            return self._by_substring[signal_name]
+
+        result = None
         for name, data in self.signal_data.items():
             if signal_name in name:
-                return data
-        return None
+                result = data
+                break
+
+        # Misses are cached too, so repeated queries stay O(1)
+        self._by_substring[signal_name] = result
+        return result
 
 
 class VGATimingAnalyzer:
     """Analyzes VGA timing signals from VCD trace"""
 
+    # Only these signals are ever analyzed; the parser skips the rest
+    SIGNALS_OF_INTEREST = ("hsync", "vsync", "activevideo")
+
     def __init__(self, vcd_file):
         self.vcd_file = vcd_file
         self.vcd = None
+        # Period entries are O(1) summaries, not per-period lists
         self.analysis_results = {
             "hsync_count": 0,
             "vsync_count": 0,
-            "hsync_period": [],
-            "vsync_period": [],
+            "hsync_period": {"count": 0, "sum": 0, "min": 0, "max": 0},
+            "vsync_period": {"count": 0, "sum": 0, "min": 0, "max": 0},
             "activevideo_cycles": 0,
             "glitches": [],
             "timing_violations": [],
@@ -106,7 +293,9 @@ class VGATimingAnalyzer:
         print(f"Parsing VCD file: {self.vcd_file}")
 
         try:
-            self.vcd = VCDParser(self.vcd_file)
+            self.vcd = VCDParser(
+                self.vcd_file, signals_of_interest=self.SIGNALS_OF_INTEREST
+            )
             self.vcd.parse()
         except Exception as e:
             print(f"Error parsing VCD: {e}")
@@ -115,8 +304,8 @@ class VGATimingAnalyzer:
         print(f"Timescale: {self.vcd.timescale}")
         print(f"End time: {self.vcd.endtime}")
 
-        # List available signals
-        signal_count = len(self.vcd.signal_data)
+        # List declared signals (only the whitelisted ones are stored)
+        signal_count = len(set(self.vcd.signals.values()))
         print(f"Found {signal_count} signals")
 
         return True
@@ -135,15 +324,12 @@ class VGATimingAnalyzer:
             hsync_edges = self._find_edges(hsync_sig, falling=True)
             self.analysis_results["hsync_count"] = len(hsync_edges)
 
-            # Calculate hsync period
-            for i in range(1, len(hsync_edges)):
-                period = hsync_edges[i] - hsync_edges[i - 1]
-                self.analysis_results["hsync_period"].append(period)
+            # Summarize hsync periods in one pass
+            periods = np.diff(hsync_edges)
 
-            if self.analysis_results["hsync_period"]:
-                avg_period = sum(self.analysis_results["hsync_period"]) / len(
-                    self.analysis_results["hsync_period"]
-                )
+            if len(periods):
+                self.analysis_results["hsync_period"] = self._summarize(periods)
+                avg_period = periods.mean()
                 print(f"  Hsync pulses: {self.analysis_results['hsync_count']}")
                 print(f"  Avg hsync period: {avg_period:.0f} time units")
         else:
@@ -155,15 +341,12 @@ class VGATimingAnalyzer:
             vsync_edges = self._find_edges(vsync_sig, falling=True)
             self.analysis_results["vsync_count"] = len(vsync_edges)
 
-            # Calculate vsync period
-            for i in range(1, len(vsync_edges)):
-                period = vsync_edges[i] - vsync_edges[i - 1]
-                self.analysis_results["vsync_period"].append(period)
+            # Summarize vsync periods in one pass
+            periods = np.diff(vsync_edges)
 
-            if self.analysis_results["vsync_period"]:
-                avg_period = sum(self.analysis_results["vsync_period"]) / len(
-                    self.analysis_results["vsync_period"]
-                )
+            if len(periods):
+                self.analysis_results["vsync_period"] = self._summarize(periods)
+                avg_period = periods.mean()
                 print(f"  Vsync pulses: {self.analysis_results['vsync_count']}")
                 print(f"  Avg vsync period: {avg_period:.0f} time units")
         else:
@@ -178,15 +361,10 @@ class VGATimingAnalyzer:
             print("  Warning: activevideo signal not found")
             return
 
-        tv = activevideo_sig
-        total_high = 0
-
-        for i in range(len(tv) - 1):
-            time, value = tv[i]
-            next_time = tv[i + 1][0]
-
-            if value == "1":
-                total_high += next_time - time
+        # Sum the durations of all high segments in one masked reduction
+        times, vals = activevideo_sig
+        durations = np.diff(times)
+        total_high = int(durations[vals[:-1] == 1].sum())
 
         self.analysis_results["activevideo_cycles"] = total_high
         print(f"  Active video cycles: {total_high}")
@@ -198,28 +376,25 @@ class VGATimingAnalyzer:
         glitch_threshold = 10  # Time units
 
         # Check key signals for glitches (exclude clk - it's supposed to toggle fast)
-        key_signals = ["hsync", "vsync", "activevideo"]
+        key_signals = self.SIGNALS_OF_INTEREST
 
         for sig_name in key_signals:
             sig = self.get_signal(sig_name)
             if not sig:
                 continue
 
-            tv = sig
-            if len(tv) < 2:
+            times, vals = sig
+            if len(times) < 2:
                 continue
 
-            for i in range(len(tv) - 1):
-                time1, val1 = tv[i]
-                time2, val2 = tv[i + 1]
-
-                if time2 - time1 < glitch_threshold and val1 != val2:
-                    glitch = {
-                        "signal": sig_name,
-                        "time": time1,
-                        "duration": time2 - time1,
-                    }
-                    self.analysis_results["glitches"].append(glitch)
+            indices, durations = find_glitches(times, vals, glitch_threshold)
+            for idx, duration in zip(indices, durations):
+                glitch = {
+                    "signal": sig_name,
+                    "time": int(times[idx]),
+                    "duration": int(duration),
+                }
+                self.analysis_results["glitches"].append(glitch)
 
         if self.analysis_results["glitches"]:
             print(
@@ -236,59 +411,70 @@ class VGATimingAnalyzer:
 
         # Instead of hardcoded values, check period consistency
         # This works for any video mode
-        max_variance = 0.01  # 1% maximum variance between periods
 
         # Validate hsync period consistency
-        if len(self.analysis_results["hsync_period"]) > 1:
-            periods = self.analysis_results["hsync_period"]
-            avg_hsync = sum(periods) / len(periods)
-            max_dev = max(abs(p - avg_hsync) for p in periods)
-            variance = max_dev / avg_hsync if avg_hsync > 0 else 0
-
-            if variance > max_variance:
-                violation = f"Hsync period inconsistent: {variance*100:.1f}% variance (max {max_variance*100:.1f}%)"
+        if self.analysis_results["hsync_period"]["count"] > 1:
+            stats = self.analysis_results["hsync_period"]
+            avg_hsync = stats["sum"] / stats["count"]
+            max_dev = max(avg_hsync - stats["min"], stats["max"] - avg_hsync)
+
+            # Compare against the folded bound; the deviation ratio is
+            # only computed when a report line needs it
+            if max_dev > _MAX_VARIANCE * avg_hsync:
+                variance = max_dev / avg_hsync if avg_hsync > 0 else 0
+                violation = f"Hsync period inconsistent: {variance*100:.1f}% variance (max {_MAX_VARIANCE_PCT:.1f}%)"
                 self.analysis_results["timing_violations"].append(violation)
                 print(f"  ✗ {violation}")
             else:
+                variance = max_dev / avg_hsync if avg_hsync > 0 else 0
                 print(
                     f"  ✓ Hsync period consistent: {avg_hsync:.0f} time units (variance {variance*100:.2f}%)"
                 )
 
         # Validate vsync period consistency
-        if len(self.analysis_results["vsync_period"]) > 1:
-            periods = self.analysis_results["vsync_period"]
-            avg_vsync = sum(periods) / len(periods)
-            max_dev = max(abs(p - avg_vsync) for p in periods)
-            variance = max_dev / avg_vsync if avg_vsync > 0 else 0
-
-            if variance > max_variance:
-                violation = f"Vsync period inconsistent: {variance*100:.1f}% variance (max {max_variance*100:.1f}%)"
+        if self.analysis_results["vsync_period"]["count"] > 1:
+            stats = self.analysis_results["vsync_period"]
+            avg_vsync = stats["sum"] / stats["count"]
+            max_dev = max(avg_vsync - stats["min"], stats["max"] - avg_vsync)
+
+            if max_dev > _MAX_VARIANCE * avg_vsync:
+                variance = max_dev / avg_vsync if avg_vsync > 0 else 0
+                violation = f"Vsync period inconsistent: {variance*100:.1f}% variance (max {_MAX_VARIANCE_PCT:.1f}%)"
                 self.analysis_results["timing_violations"].append(violation)
                 print(f"  ✗ {violation}")
             else:
+                variance = max_dev / avg_vsync if avg_vsync > 0 else 0
                 print(
                     f"  ✓ Vsync period consistent: {avg_vsync:.0f} time units (variance {variance*100:.2f}%)"
                 )
 
-    def _find_edges(self, signal_tv, falling=True):
-        """Find falling or rising edges in signal data"""
-        edges = []
+    @staticmethod
+    def _summarize(periods):
+        """Reduce a period array to count/sum/min/max"""
+        return {
+            "count": int(periods.size),
+            "sum": int(periods.sum()),
+            "min": int(periods.min()),
+            "max": int(periods.max()),
+        }
 
-        for i in range(len(signal_tv) - 1):
-            time1, val1 = signal_tv[i]
-            time2, val2 = signal_tv[i + 1]
+    def _find_edges(self, signal_tv, falling=True):
+        """Find falling or rising edge times in (times, values) arrays"""
+        times, vals = signal_tv
+        prev = vals[:-1]
+        nxt = vals[1:]
 
-            if falling and val1 == "1" and val2 == "0":
-                edges.append(time2)
-            elif not falling and val1 == "0" and val2 == "1":
-                edges.append(time2)
+        if falling:
+            mask = (prev == 1) & (nxt == 0)
+        else:
+            mask = (prev == 0) & (nxt == 1)
 
-        return edges
+        return times[1:][mask]
 
     def list_signals(self):
-        """List all available signals in VCD"""
+        """List all signals declared in the VCD header"""
         print("\nAvailable signals:")
-        for sig_name in sorted(self.vcd.signal_data.keys()):
+        for sig_name in sorted(set(self.vcd.signals.values())):
             print(f"  {sig_name}")
 
     def generate_report(self, output_file=None):
@@ -306,16 +492,14 @@ class VGATimingAnalyzer:
         report.append(f"Hsync pulses: {self.analysis_results['hsync_count']}")
         report.append(f"Vsync pulses: {self.analysis_results['vsync_count']}")
 
-        if self.analysis_results["hsync_period"]:
-            avg = sum(self.analysis_results["hsync_period"]) / len(
-                self.analysis_results["hsync_period"]
-            )
+        hsync_stats = self.analysis_results["hsync_period"]
+        if hsync_stats["count"]:
+            avg = hsync_stats["sum"] / hsync_stats["count"]
             report.append(f"Avg hsync period: {avg:.2f} time units")
 
-        if self.analysis_results["vsync_period"]:
-            avg = sum(self.analysis_results["vsync_period"]) / len(
-                self.analysis_results["vsync_period"]
-            )
+        vsync_stats = self.analysis_results["vsync_period"]
+        if vsync_stats["count"]:
+            avg = vsync_stats["sum"] / vsync_stats["count"]
             report.append(f"Avg vsync period: {avg:.2f} time units")
 
         report.append(
@@ -0,0 +1,234 @@
+// VGA Nyancat is freely redistributable under the MIT License. See the file
+// "LICENSE" for information on usage and redistribution of this file.
+//
+// Nyancat Animation Extractor and VGA Converter (C99 rewrite)
+//
+// Build-time counterpart of gen-nyancat.py producing bit-for-bit
+// identical output; the Python script remains the reference
+// implementation. Extracts animation frames from the nyancat source
+// and converts them to the compact hardware format: 64x64 frames as
+// 4-bit character indices plus a 6-bit VGA color palette.
+//
+// Input:  animation.c from nyancat project
+// Output: nyancat-frames.hex (compressed format)
+//         nyancat-colors.hex (color palette)
+
+#define _GNU_SOURCE  // memmem
+
+#include <fcntl.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <unistd.h>
+
+// Color mapping from nyancat (truecolor mode, case 8), in palette
+// index order; must match COLOR_MAP in gen-nyancat.py
+typedef struct {
+    char ch;
+    unsigned char r, g, b;
+} palette_entry_t;
+
+static const palette_entry_t palette[] = {
+    {',', 0, 49, 105},     // 0: Blue background
+    {'.', 255, 255, 255},  // 1: White stars
+    {'\'', 0, 0, 0},       // 2: Black border
+    {'@', 255, 205, 152},  // 3: Tan poptart
+    {'$', 255, 169, 255},  // 4: Pink poptart
+    {'-', 255, 76, 152},   // 5: Red poptart
+    {'>', 255, 25, 0},     // 6: Red rainbow
+    {'&', 255, 154, 0},    // 7: Orange rainbow
+    {'+', 255, 240, 0},    // 8: Yellow rainbow
+    {'#', 40, 220, 0},     // 9: Green rainbow
+    {'=', 0, 144, 255},    // 10: Light blue rainbow
+    {';', 104, 68, 255},   // 11: Dark blue rainbow
+    {'*', 153, 153, 153},  // 12: Gray cat face
+    {'%', 255, 163, 152},  // 13: Pink cheeks
+};
+
+#define PALETTE_SIZE (sizeof(palette) / sizeof(palette[0]))
+
+#define MAX_FRAMES 256
+
+typedef struct {
+    long num;           // Frame number from the frameN identifier
+    const char *body;   // Start of the {...} initializer content
+    size_t body_len;
+} frame_t;
+
+// Convert 8-bit RGB to 6-bit VGA format (2R2G2B)
+static unsigned rgb_to_vga6(unsigned r, unsigned g, unsigned b)
+{
+    return ((r >> 6) << 4) | ((g >> 6) << 2) | (b >> 6);
+}
+
+static int frame_cmp(const void *a, const void *b)
+{
+    long na = ((const frame_t *) a)->num;
+    long nb = ((const frame_t *) b)->num;
+    return (na > nb) - (na < nb);
+}
+
+// Locate every "const char * frameN[] = {...};" block in the source
+static size_t find_frames(const char *buf, size_t len, frame_t *frames)
+{
+    static const char marker[] = "const char * frame";
+    const char *p = buf;
+    const char *end = buf + len;
+    size_t count = 0;
+
+    while (count < MAX_FRAMES &&
+           (p = memmem(p, (size_t) (end - p), marker, sizeof(marker) - 1))) {
+        char *after;
+        long num = strtol(p + sizeof(marker) - 1, &after, 10);
+        p += sizeof(marker) - 1;
+
+        const char *open = memchr(after, '{', (size_t) (end - after));
+        if (!open)
+            break;
+        const char *close = memchr(open, '}', (size_t) (end - open));
+        if (!close)
+            break;
+
+        frames[count].num = num;
+        frames[count].body = open + 1;
+        frames[count].body_len = (size_t) (close - open - 1);
+        count++;
+        p = close;
+    }
+
+    qsort(frames, count, sizeof(frame_t), frame_cmp);
+    return count;
+}
+
+// Emit the "..." string literals of one frame as hex digit lines;
+// returns the number of pixels written
+static size_t emit_frame(FILE *out, const frame_t *frame,
+                         const char hexnl[256][2])
+{
+    const char *p = frame->body;
+    const char *end = p + frame->body_len;
+    char line[2048];
+    size_t pixels = 0;
+
+    fprintf(out, "// Frame %ld\n", frame->num);
+
+    while ((p = memchr(p, '"', (size_t) (end - p)))) {
+        p++;
+        const char *quote = memchr(p, '"', (size_t) (end - p));
+        if (!quote)
+            break;
+
+        // One precomputed [hex digit, '\n'] pair per pixel, written
+        // in a single call per frame line
+        while (p < quote) {
+            size_t n = 0;
+            while (p < quote && n + 2 <= sizeof(line)) {
+                memcpy(line + n, hexnl[(unsigned char) *p], 2);
+                n += 2;
+                p++;
+            }
+            fwrite(line, 1, n, out);
+            pixels += n / 2;
+        }
+        p = quote + 1;
+    }
+
+    return pixels;
+}
+
+int main(int argc, char *argv[])
+{
+    if (argc < 2) {
+        fprintf(stderr, "Usage: %s <animation.c> [output_dir]\n", argv[0]);
+        return 1;
+    }
+
+    const char *input_file = argv[1];
+    const char *output_dir = argc >= 3 ? argv[2] : "rtl";
+
+    int fd = open(input_file, O_RDONLY);
+    if (fd < 0) {
+        perror(input_file);
+        return 1;
+    }
+
+    struct stat st;
+    if (fstat(fd, &st) < 0 || st.st_size == 0) {
+        fprintf(stderr, "Error: cannot read %s\n", input_file);
+        close(fd);
+        return 1;
+    }
+
+    const char *buf =
+        mmap(NULL, (size_t) st.st_size, PROT_READ, MAP_PRIVATE, fd, 0);
+    close(fd);
+    if (buf == MAP_FAILED) {
+        perror("mmap");
+        return 1;
+    }
+
+    printf("Parsing %s...\n", input_file);
+
+    static frame_t frames[MAX_FRAMES];
+    size_t frame_count = find_frames(buf, (size_t) st.st_size, frames);
+    printf("Found %zu frames\n", frame_count);
+
+    if (frame_count == 0) {
+        fprintf(stderr, "Error: No frames found!\n");
+        return 1;
+    }
+
+    printf("Character palette: %zu colors\n", PALETTE_SIZE);
+
+    // Per-byte [hex digit, newline] lookup table for frame emission
+    char hexnl[256][2];
+    for (size_t i = 0; i < 256; i++) {
+        hexnl[i][0] = '0';  // Unknown characters -> background
+        hexnl[i][1] = '\n';
+    }
+    for (size_t i = 0; i < PALETTE_SIZE; i++)
+        hexnl[(unsigned char) palette[i].ch][0] = "0123456789abcdef"[i];
+
+    char path[4096];
+
+    // Write color palette
+    snprintf(path, sizeof(path), "%s/nyancat-colors.hex", output_dir);
+    printf("\nWriting %s...\n", path);
+    FILE *out = fopen(path, "w");
+    if (!out) {
+        perror(path);
+        return 1;
+    }
+    fprintf(out, "// Nyancat color palette (6-bit VGA: RRGGBB)\n");
+    for (size_t i = 0; i < PALETTE_SIZE; i++) {
+        const palette_entry_t *e = &palette[i];
+        fprintf(out, "%02x  // %2zu: '%c' RGB(%u, %u, %u)\n",
+                rgb_to_vga6(e->r, e->g, e->b), i, e->ch, e->r, e->g, e->b);
+    }
+    fclose(out);
+
+    // Write frames (4-bit indices, 64x64 per frame)
+    snprintf(path, sizeof(path), "%s/nyancat-frames.hex", output_dir);
+    printf("Writing %s...\n", path);
+    out = fopen(path, "w");
+    if (!out) {
+        perror(path);
+        return 1;
+    }
+    size_t total_pixels = 0;
+    for (size_t i = 0; i < frame_count; i++)
+        total_pixels += emit_frame(out, &frames[i], hexnl);
+    fclose(out);
+
+    munmap((void *) buf, (size_t) st.st_size);
+
+    printf("\nDone! Generated %zu frames\n", frame_count);
+    printf("Frame size: 64x64 pixels\n");
+    printf("Total: %zu pixels (%.1f KB)\n", total_pixels,
+           (double) total_pixels / 1024);
+    printf("Color palette: %zu colors\n", PALETTE_SIZE);
+
+    return 0;
+}
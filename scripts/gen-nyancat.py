@@ -13,6 +13,7 @@ Output: nyancat-frames.hex (compressed format)
 
 import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 
@@ -50,18 +51,30 @@ def build_char_to_index():
     return {ch: idx for idx, ch in enumerate(chars)}
 
 
+def build_hex_translation(char_to_idx):
+    """Build a 256-entry table mapping palette bytes to hex digit bytes."""
+    table = bytearray(b"0" * 256)  # Unknown characters -> background (0)
+    for ch, idx in char_to_idx.items():
+        table[ord(ch)] = ord(format(idx, "x"))
+    return bytes(table)
+
+
+# Compiled once at import; matching on bytes avoids decoding the whole file
+_FRAME_RE = re.compile(rb"const char \* frame(\d+)\[\] = \{([^}]+)\};", re.DOTALL)
+_LINE_RE = re.compile(rb'"([^"]+)"')
+
+
 def parse_animation_c(filepath):
     """Parse animation.c and extract all frame data."""
-    with open(filepath, "r") as f:
-        content = f.read()
+    content = Path(filepath).read_bytes()
 
-    frame_pattern = r"const char \* frame(\d+)\[\] = \{([^}]+)\};"
     frames = []
 
-    for match in re.finditer(frame_pattern, content, re.DOTALL):
+    for match in _FRAME_RE.finditer(content):
         frame_num = int(match.group(1))
-        frame_data = match.group(2)
-        lines = re.findall(r'"([^"]+)"', frame_data)
+        lines = [
+            m.group(1).decode("latin1") for m in _LINE_RE.finditer(match.group(2))
+        ]
 
         if len(lines) > 0:
             frames.append((frame_num, lines))
@@ -70,6 +83,25 @@ def parse_animation_c(filepath):
     return frames
 
 
+def render_frame(args):
+    """Render one frame to hex bytes; runs in worker processes."""
+    frame_num, lines, trans = args
+    chunks = [b"// Frame %d\n" % frame_num]
+    pixels = 0
+
+    # Translate whole lines to hex digits in one C call, then
+    # interleave newlines via strided copy
+    for line in lines:
+        digits = line.encode("latin1").translate(trans)
+        out = bytearray(2 * len(digits))
+        out[0::2] = digits
+        out[1::2] = b"\n" * len(digits)
+        chunks.append(out)
+        pixels += len(digits)
+
+    return b"".join(chunks), pixels
+
+
 def main():
     if len(sys.argv) < 2:
         print(f"Usage: {sys.argv[0]} <animation.c> [output_dir]")
@@ -109,18 +141,21 @@ def main():
 
     # Write frames (4-bit indices, 64x64 per frame)
     print(f"Writing {frames_file}...")
-    total_pixels = 0
-
-    with open(frames_file, "w") as f:
-        for frame_num, lines in frames:
-            f.write(f"// Frame {frame_num}\n")
-
-            # Each frame is 64x64
-            for y, line in enumerate(lines):
-                for x, char in enumerate(line):
-                    idx = char_to_idx.get(char, 0)  # Default to background
-                    f.write(f"{idx:x}\n")
-                    total_pixels += 1
+
+    trans = build_hex_translation(char_to_idx)
+
+    # Frames are independent; render them in parallel (map preserves
+    # the sorted frame order)
+    with ProcessPoolExecutor() as executor:
+        rendered = list(
+            executor.map(render_frame, ((num, lines, trans) for num, lines in frames))
+        )
+
+    total_pixels = sum(pixels for _, pixels in rendered)
+
+    # One write for the whole file; avoids per-frame write() traffic
+    with open(frames_file, "wb") as f:
+        f.write(b"".join(chunk for chunk, _ in rendered))
 
     frames_kb = total_pixels / 1024
     print(f"\nDone! Generated {len(frames)} frames")